@@ -8,24 +8,107 @@ Internally, timestamps are stored as Unix epoch integers.  The API
 converts them to ISO-8601 strings for JSON responses and CSV export.
 """
 
-import csv
-import io
+import functools
+import gzip
 import os
 import sqlite3
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
 
-from flask import Flask, Response, g, jsonify, render_template, request
+from flask import (Flask, Response, jsonify, make_response,
+                   render_template, request)
 from tmon.paths import find_db
 
 
 def _ts_to_iso(ts: int) -> str:
     """Convert Unix timestamp to ISO-8601 UTC string."""
-    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime(
-        "%Y-%m-%dT%H:%M:%SZ"
-    )
+    t = time.gmtime(ts)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z")
 
 _DB_PATH = os.environ.get("TMON_DB") or find_db("tmon.db")
 
+# Lowest and highest row id, the data version behind the ETags.  Each
+# aggregate gets its own subquery so SQLite answers it with one probe
+# at either end of the rowid B-tree; MIN and MAX in a single SELECT
+# defeat that optimization and scan a whole index.
+_VERSION = (
+    "SELECT (SELECT MIN(id) FROM readings), (SELECT MAX(id) FROM readings)"
+)
+
+# Newest row per client.  The recursive CTE skip-scans the (addr, ts)
+# index for each distinct address, and the newest row of each is one
+# more index probe, so the cost grows with the number of clients rather
+# than the number of rows.  An empty table yields no rows.
+_CURRENT = (
+    "WITH RECURSIVE a(addr) AS ("
+    "  SELECT MIN(addr) FROM readings"
+    "  UNION ALL"
+    "  SELECT (SELECT MIN(addr) FROM readings WHERE addr > a.addr)"
+    "  FROM a WHERE a.addr IS NOT NULL"
+    ")"
+    " SELECT r.addr, r.ts, r.temp_0, r.temp_1, r.temp_2, r.temp_3"
+    " FROM a JOIN readings AS r ON r.id = ("
+    "   SELECT id FROM readings WHERE addr = a.addr"
+    "   ORDER BY ts DESC LIMIT 1"
+    " )"
+    " ORDER BY r.addr"
+)
+
+# History window for one client, oldest first.  Fetched with :limit
+# set one past the point budget: a window that fits is returned whole
+# and a longer one is only read this far before _HISTORY reduces it.
+_WINDOW = (
+    "SELECT ts, temp_0, temp_1, temp_2, temp_3 FROM readings"
+    " WHERE addr = :addr AND ts >= :start AND ts <= :end"
+    " ORDER BY ts LIMIT :limit"
+)
+
+# History window for one client, reduced inside SQLite with MinMax:
+# :start..:end is cut into :buckets spans of equal time and each span
+# keeps the row holding its lowest and the row holding its highest
+# temp_0 (SQLite fills the bare columns from the row that MIN or MAX
+# picked), so short spikes survive downsampling.  The bucket comes from
+# ts alone, so no row is numbered or sorted window-wide.
+#
+# MIN and MAX run over keys that make the pick explicit: temp_0 (an
+# int16) in the high bits and the offset into the window in the low 32,
+# added for lo and subtracted for hi, so ties go to the earliest row.
+# NULL temp_0 maps past either end of the int16 range, so it is picked
+# only when the whole bucket is NULL, and then the earliest row wins.
+_HISTORY = (
+    "WITH w AS ("
+    "  SELECT ts, temp_0, temp_1, temp_2, temp_3,"
+    "         (ts - :start) * :buckets / (:end - :start + 1) AS b,"
+    "         COALESCE(temp_0, 65536) * 4294967296 + (ts - :start) AS lo,"
+    "         COALESCE(temp_0, -65536) * 4294967296 - (ts - :start) AS hi"
+    "  FROM readings"
+    "  WHERE addr = :addr AND ts >= :start AND ts <= :end"
+    ")"
+    " SELECT ts, temp_0, temp_1, temp_2, temp_3 FROM ("
+    "   SELECT ts, temp_0, temp_1, temp_2, temp_3, MIN(lo)"
+    "   FROM w GROUP BY b"
+    " )"
+    " UNION"
+    " SELECT ts, temp_0, temp_1, temp_2, temp_3 FROM ("
+    "   SELECT ts, temp_0, temp_1, temp_2, temp_3, MAX(hi)"
+    "   FROM w GROUP BY b HAVING :points > 1"
+    " )"
+    " ORDER BY ts"
+)
+
+# CSV export header, and how much text to buffer before each yield.
+# Every field is an ISO timestamp or an integer, so nothing ever needs
+# quoting and rows are formatted directly (CRLF, as csv.writer would).
+_CSV_HEADER = "ts,temp_0,temp_1,temp_2,temp_3\r\n"
+_CSV_CHUNK = 8192
+
+# Response types worth gzipping, and the smallest body worth the effort.
+_COMPRESS_TYPES = ("application/json", "text/csv")
+_COMPRESS_MIN = 512
+
 
 def create_app(db_path: str) -> Flask:
     """Create and configure the Flask application.
@@ -35,20 +118,75 @@ def create_app(db_path: str) -> Flask:
     """
     app = Flask(__name__)
     app.config["TMON_DB"] = db_path
+    # Rows are built with their keys already in a fixed order; skip
+    # re-sorting every dict of every history payload.
+    app.json.sort_keys = False
+
+    local = threading.local()
+
+    @app.after_request
+    def _compress(resp: Response) -> Response:
+        """Gzip JSON and CSV bodies for clients that accept it.
+
+        gunicorn serves the panel directly, with no proxy in front to
+        do this.  Streamed bodies (the CSV export) are compressed chunk
+        by chunk as they are produced.  Every response of a compressible
+        type varies on Accept-Encoding, compressed or not, so caches never
+        hand one encoding to a client that asked for the other.  The 304s
+        from ``_revalidate`` stand in for such bodies and vary too.
+        """
+        if resp.mimetype in _COMPRESS_TYPES or resp.status_code == 304:
+            resp.vary.add("Accept-Encoding")
+        if (resp.status_code != 200
+                or resp.mimetype not in _COMPRESS_TYPES
+                or not request.accept_encodings.quality("gzip")):
+            return resp
+        if resp.is_streamed:
+            resp.response = _gzip_stream(resp.response)
+        else:
+            body = resp.get_data()
+            if len(body) < _COMPRESS_MIN:
+                return resp
+            resp.set_data(gzip.compress(body, 6))
+        resp.headers["Content-Encoding"] = "gzip"
+        return resp
 
     def _get_db() -> sqlite3.Connection:
-        """Return a per-request database connection."""
-        if "db" not in g:
-            g.db = sqlite3.connect(app.config["TMON_DB"])
-            g.db.row_factory = sqlite3.Row
-        return g.db
-
-    @app.teardown_appcontext
-    def _close_db(exc: BaseException | None) -> None:
-        """Close the database connection at end of request."""
-        db = g.pop("db", None)
-        if db is not None:
-            db.close()
+        """Return this thread's database connection, opening it once.
+
+        The connection outlives the request so SQLite's page cache and
+        the parsed schema are reused by the next request on the thread.
+        """
+        db = getattr(local, "db", None)
+        if db is None:
+            db = sqlite3.connect(app.config["TMON_DB"])
+            local.db = db
+        return db
+
+    def _revalidate(view: Callable) -> Callable:
+        """Tag *view*'s response with the data version; answer 304 on a match.
+
+        Rows are only ever appended, or purged oldest-first, so the
+        lowest and highest row ids identify the table contents (see
+        ``_VERSION``).  The ETag is weak because
+        ``_compress`` may send the same data gzipped or not.
+        """
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs) -> Response:
+            """Run *view* unless the client's copy is still current."""
+            lo, hi = _get_db().execute(_VERSION).fetchone()
+            etag = "{}-{}".format(lo, hi)
+            if request.if_none_match.contains_weak(etag):
+                resp = Response(status=304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag, weak=True)
+            resp.cache_control.no_cache = True
+            return resp
+
+        return wrapper
 
     @app.route("/")
     def index() -> str:
@@ -56,36 +194,30 @@ def create_app(db_path: str) -> Flask:
         return render_template("index.html")
 
     @app.route("/api/current")
+    @_revalidate
     def api_current() -> tuple:
         """Return the latest reading per client.
 
         Response JSON:
             [{"addr": 1, "ts": "2024-01-01T00:00:00Z", "temp_0": 220, ...}, ...]
         """
-        db = _get_db()
-        max_ts = db.execute(
-            "SELECT MAX(ts) FROM readings"
-        ).fetchone()[0]
-        if max_ts is None:
-            return jsonify([]), 200
-        rows = db.execute(
-            "SELECT addr, ts, temp_0, temp_1, temp_2, temp_3"
-            " FROM readings WHERE ts = ("
-            "   SELECT MAX(ts) FROM readings AS r2"
-            "   WHERE r2.addr = readings.addr"
-            " ) GROUP BY addr ORDER BY addr"
-        ).fetchall()
-        result = []
-        for r in rows:
-            d = dict(r)
-            d["ts"] = _ts_to_iso(d["ts"])
-            result.append(d)
+        rows = _get_db().execute(_CURRENT).fetchall()
+        result = [
+            {"addr": addr, "ts": _ts_to_iso(ts),
+             "temp_0": t0, "temp_1": t1, "temp_2": t2, "temp_3": t3}
+            for addr, ts, t0, t1, t2, t3 in rows
+        ]
         return jsonify(result), 200
 
     @app.route("/api/history")
+    @_revalidate
     def api_history() -> tuple:
         """Return historical readings for one client, downsampled.
 
+        Long windows are reduced to at most *points* rows by keeping
+        the minimum and maximum temp_0 of each of points/2 equal-time
+        buckets.
+
         Query parameters:
             addr: Client address (required, integer).
             hours: Time window in hours (default 24).
@@ -118,23 +250,28 @@ def create_app(db_path: str) -> Flask:
         start_ts = max_ts - int(hours * 3600)
 
         rows = db.execute(
-            "SELECT ts, temp_0, temp_1, temp_2, temp_3"
-            " FROM readings"
-            " WHERE addr = ? AND ts >= ? AND ts <= ?"
-            " ORDER BY ts",
-            (addr, start_ts, max_ts),
+            _WINDOW,
+            {"addr": addr, "start": start_ts, "end": max_ts,
+             "limit": points + 1},
         ).fetchall()
-
-        # Downsample by stepping through evenly
-        sampled = _downsample(rows, points)
-        result = []
-        for r in sampled:
-            d = dict(r)
-            d["ts"] = _ts_to_iso(d["ts"])
-            result.append(d)
+        if len(rows) > points:
+            # Bucket from the first reading actually in the window, so
+            # an empty stretch before it does not waste buckets.
+            rows = db.execute(
+                _HISTORY,
+                {"addr": addr, "start": rows[0][0], "end": max_ts,
+                 "points": points, "buckets": max(points // 2, 1)},
+            ).fetchall()
+
+        result = [
+            {"ts": _ts_to_iso(ts),
+             "temp_0": t0, "temp_1": t1, "temp_2": t2, "temp_3": t3}
+            for ts, t0, t1, t2, t3 in rows
+        ]
         return jsonify(result), 200
 
     @app.route("/api/sensors")
+    @_revalidate
     def api_sensors() -> tuple:
         """Return a list of distinct client addresses.
 
@@ -145,7 +282,7 @@ def create_app(db_path: str) -> Flask:
         rows = db.execute(
             "SELECT DISTINCT addr FROM readings ORDER BY addr"
         ).fetchall()
-        return jsonify([r["addr"] for r in rows]), 200
+        return jsonify([addr for (addr,) in rows]), 200
 
     @app.route("/api/export")
     def api_export() -> Response:
@@ -159,7 +296,8 @@ def create_app(db_path: str) -> Flask:
             hours: Time window in hours (required, positive float).
 
         Returns a CSV download with columns ts, temp_0 .. temp_3.
-        Timestamps are exported as ISO-8601 strings.
+        Timestamps are exported as ISO-8601 strings.  Rows are streamed
+        from the cursor, so memory use does not grow with the window.
         """
         addr = request.args.get("addr", type=int)
         if addr is None:
@@ -176,39 +314,51 @@ def create_app(db_path: str) -> Flask:
             "SELECT MAX(ts) FROM readings WHERE addr = ?", (addr,)
         ).fetchone()[0]
         if max_ts is None:
-            buf = io.StringIO()
-            csv.writer(buf).writerow(
-                ["ts", "temp_0", "temp_1", "temp_2", "temp_3"]
-            )
-            return Response(buf.getvalue(), mimetype="text/csv")
+            return Response(_CSV_HEADER, mimetype="text/csv")
 
         start_ts = max_ts - int(hours * 3600)
 
-        rows = db.execute(
-            "SELECT ts, temp_0, temp_1, temp_2, temp_3"
-            " FROM readings"
-            " WHERE addr = ? AND ts >= ? AND ts <= ?"
-            " ORDER BY ts",
-            (addr, start_ts, max_ts),
-        ).fetchall()
-
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(["ts", "temp_0", "temp_1", "temp_2", "temp_3"])
-        for row in rows:
-            writer.writerow([
-                _ts_to_iso(row["ts"]),
-                row["temp_0"] if row["temp_0"] is not None else "",
-                row["temp_1"] if row["temp_1"] is not None else "",
-                row["temp_2"] if row["temp_2"] is not None else "",
-                row["temp_3"] if row["temp_3"] is not None else "",
-            ])
+        def generate():
+            """Yield the CSV in chunks as rows come off the cursor.
+
+            Uses its own connection: the body may be sent after the
+            view returns, and the thread's shared one must stay free
+            for the next request.
+            """
+            conn = sqlite3.connect(app.config["TMON_DB"])
+            try:
+                rows = conn.execute(
+                    "SELECT ts, temp_0, temp_1, temp_2, temp_3"
+                    " FROM readings"
+                    " WHERE addr = ? AND ts >= ? AND ts <= ?"
+                    " ORDER BY ts",
+                    (addr, start_ts, max_ts),
+                )
+                buf = [_CSV_HEADER]
+                size = 0
+                for ts, t0, t1, t2, t3 in rows:
+                    line = "{},{},{},{},{}\r\n".format(
+                        _ts_to_iso(ts),
+                        "" if t0 is None else t0,
+                        "" if t1 is None else t1,
+                        "" if t2 is None else t2,
+                        "" if t3 is None else t3,
+                    )
+                    buf.append(line)
+                    size += len(line)
+                    if size >= _CSV_CHUNK:
+                        yield "".join(buf)
+                        buf.clear()
+                        size = 0
+                yield "".join(buf)
+            finally:
+                conn.close()
 
         start_iso = _ts_to_iso(start_ts).replace(":", "-")
         end_iso = _ts_to_iso(max_ts).replace(":", "-")
         filename = "tmon_node{}_{}_{}.csv".format(addr, start_iso, end_iso)
         return Response(
-            buf.getvalue(),
+            generate(),
             mimetype="text/csv",
             headers={
                 "Content-Disposition": 'attachment; filename="{}"'.format(
@@ -218,6 +368,7 @@ def create_app(db_path: str) -> Flask:
         )
 
     @app.route("/api/range")
+    @_revalidate
     def api_range() -> tuple:
         """Return the min and max timestamps in the database.
 
@@ -225,31 +376,33 @@ def create_app(db_path: str) -> Flask:
             {"min": "2024-01-01T00:00:00Z", "max": "2024-12-31T23:59:30Z"}
         """
         db = _get_db()
-        row = db.execute(
-            "SELECT MIN(ts) as min_ts, MAX(ts) as max_ts FROM readings"
+        min_ts, max_ts = db.execute(
+            "SELECT MIN(ts), MAX(ts) FROM readings"
         ).fetchone()
-        if row["min_ts"] is None:
+        if min_ts is None:
             return jsonify({"min": None, "max": None}), 200
         return jsonify({
-            "min": _ts_to_iso(row["min_ts"]),
-            "max": _ts_to_iso(row["max_ts"]),
+            "min": _ts_to_iso(min_ts),
+            "max": _ts_to_iso(max_ts),
         }), 200
 
     return app
 
 
-def _downsample(rows: list, max_points: int) -> list:
-    """Return at most *max_points* evenly spaced items from *rows*."""
-    n = len(rows)
-    if n <= max_points:
-        return rows
-    step = n / max_points
-    result = []
-    pos = 0.0
-    while len(result) < max_points and int(pos) < n:
-        result.append(rows[int(pos)])
-        pos += step
-    return result
+def _gzip_stream(chunks: Iterable[str | bytes]) -> Iterator[bytes]:
+    """Yield a gzip stream of *chunks* (str or bytes), then close them."""
+    z = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = z.compress(chunk)
+            if data:
+                yield data
+        yield z.flush()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
 
 
 # Default app instance for `flask --app app run`
@@ -9,42 +9,86 @@ import pytest
 from tmon.storage import SCHEMA
 
 
-@pytest.fixture()
-def empty_db():
-    """Yield a path to a temporary empty database with the readings table."""
+def _clone(template: sqlite3.Connection) -> str:
+    """Copy *template* into a new temporary database file; return its path."""
     fd, path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
-    conn = sqlite3.connect(path)
-    conn.executescript(SCHEMA)
-    conn.commit()
+    conn = sqlite3.connect(path, isolation_level=None)
+    # Throwaway file: skip the fsyncs the copy would otherwise pay.
+    conn.execute("PRAGMA synchronous=OFF")
+    template.backup(conn)
     conn.close()
-    yield path
-    os.unlink(path)
+    return path
 
 
-@pytest.fixture()
-def sample_db():
-    """Yield a path to a database with a handful of test rows."""
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    conn = sqlite3.connect(path)
+# Unix timestamps for 2024-06-01 12:00:00Z, 12:00:30Z, 12:01:00Z
+_TS_BASE = 1717243200  # 2024-06-01T12:00:00Z
+_SAMPLE_ROWS = [
+    (_TS_BASE, 1, 220, 230, 240, None),
+    (_TS_BASE + 30, 1, 221, 231, 241, None),
+    (_TS_BASE, 2, 180, 190, None, None),
+    (_TS_BASE + 30, 2, 181, 191, None, None),
+    (_TS_BASE + 60, 1, 222, 232, 242, None),
+    (_TS_BASE + 60, 2, 182, 192, None, None),
+]
+
+
+def _make_db(rows: list) -> sqlite3.Connection:
+    """Return an in-memory database with the schema and *rows*."""
+    conn = sqlite3.connect(":memory:")
     conn.executescript(SCHEMA)
-    # Unix timestamps for 2024-06-01 12:00:00Z, 12:00:30Z, 12:01:00Z
-    ts_base = 1717243200  # 2024-06-01T12:00:00Z
-    rows = [
-        (ts_base, 1, 220, 230, 240, None),
-        (ts_base + 30, 1, 221, 231, 241, None),
-        (ts_base, 2, 180, 190, None, None),
-        (ts_base + 30, 2, 181, 191, None, None),
-        (ts_base + 60, 1, 222, 232, 242, None),
-        (ts_base + 60, 2, 182, 192, None, None),
-    ]
     conn.executemany(
         "INSERT INTO readings (ts, addr, temp_0, temp_1, temp_2, temp_3)"
         " VALUES (?, ?, ?, ?, ?, ?)",
         rows,
     )
     conn.commit()
+    return conn
+
+
+@pytest.fixture(scope="session")
+def _empty_template():
+    """One in-memory database with the readings table, built once."""
+    conn = _make_db([])
+    yield conn
     conn.close()
+
+
+@pytest.fixture(scope="session")
+def _sample_template():
+    """One in-memory database holding the sample rows, built once."""
+    conn = _make_db(_SAMPLE_ROWS)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture()
+def empty_db(_empty_template):
+    """Yield a path to a temporary empty database with the readings table."""
+    path = _clone(_empty_template)
+    yield path
+    os.unlink(path)
+
+
+@pytest.fixture()
+def sample_db(_sample_template):
+    """Yield a path to a database with a handful of test rows."""
+    path = _clone(_sample_template)
+    yield path
+    os.unlink(path)
+
+
+@pytest.fixture(scope="module")
+def module_empty_db(_empty_template):
+    """Like empty_db, but shared by a module's read-only tests."""
+    path = _clone(_empty_template)
+    yield path
+    os.unlink(path)
+
+
+@pytest.fixture(scope="module")
+def module_sample_db(_sample_template):
+    """Like sample_db, but shared by a module's read-only tests."""
+    path = _clone(_sample_template)
     yield path
     os.unlink(path)
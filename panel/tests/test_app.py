@@ -1,31 +1,62 @@
 """Tests for the Flask API endpoints."""
 
 import csv
+import gzip
 import io
 import json
 import sqlite3
+from datetime import datetime, timezone
 
 import pytest
 
-from app import create_app
+from app import _VERSION, _ts_to_iso, create_app
 
 
-@pytest.fixture()
-def client(sample_db):
-    """Yield a Flask test client backed by the sample database."""
-    app = create_app(sample_db)
+def _insert_series(db_path: str, temps: list) -> None:
+    """Add one client 1 row per temp_0 value, 30 s apart."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executemany(
+        "INSERT INTO readings (ts, addr, temp_0, temp_1, temp_2, temp_3)"
+        " VALUES (?, 1, ?, NULL, NULL, NULL)",
+        [(1717243200 + 30 * i, t) for i, t in enumerate(temps)],
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def client(module_sample_db):
+    """Return a Flask test client backed by the sample database.
+
+    Shared by the whole module: tests using it must not write.
+    """
+    app = create_app(module_sample_db)
     app.config["TESTING"] = True
-    with app.test_client() as c:
-        yield c
+    return app.test_client()
 
 
-@pytest.fixture()
-def empty_client(empty_db):
-    """Yield a Flask test client backed by an empty database."""
-    app = create_app(empty_db)
+@pytest.fixture(scope="module")
+def empty_client(module_empty_db):
+    """Return a Flask test client backed by an empty database.
+
+    Shared by the whole module: tests using it must not write.
+    """
+    app = create_app(module_empty_db)
     app.config["TESTING"] = True
-    with app.test_client() as c:
-        yield c
+    return app.test_client()
+
+
+class TestTsToIso:
+    """Tests for _ts_to_iso."""
+
+    def test_matches_strftime(self):
+        """Output agrees with datetime.strftime, zero padding included."""
+        for ts in (0, 1717243200, 1717243261, 4102444799):
+            expected = datetime.fromtimestamp(ts, tz=timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+            assert _ts_to_iso(ts) == expected
 
 
 class TestIndex:
@@ -102,6 +133,32 @@ class TestApiHistory:
         data = json.loads(resp.data)
         assert len(data) == 2
 
+    def test_downsampling_keeps_extremes(self, empty_db):
+        """Each bucket keeps its min and max temp_0, so spikes survive."""
+        temps = [5, 5, 90, 5, 5, 5, 5, 5, -20, 5]
+        _insert_series(empty_db, temps)
+        app = create_app(empty_db)
+        with app.test_client() as c:
+            data = json.loads(c.get(
+                "/api/history?addr=1&hours=1&points=4").data)
+            one = json.loads(c.get(
+                "/api/history?addr=1&hours=1&points=1").data)
+        assert [d["temp_0"] for d in data] == [5, 90, 5, -20]
+        assert [d["temp_0"] for d in one] == [-20]
+
+    def test_downsampling_ties_and_nulls(self, empty_db):
+        """Ties keep the earliest row; NULL temp_0 only wins an all-NULL bucket."""
+        temps = [None, 7, 7, 3, 3, None, None, None, None, None]
+        _insert_series(empty_db, temps)
+        with create_app(empty_db).test_client() as c:
+            data = json.loads(c.get(
+                "/api/history?addr=1&hours=1&points=4").data)
+        assert [(d["ts"], d["temp_0"]) for d in data] == [
+            ("2024-06-01T12:00:30Z", 7),
+            ("2024-06-01T12:01:30Z", 3),
+            ("2024-06-01T12:02:30Z", None),
+        ]
+
     def test_null_handling(self, client):
         """Null temperature values are preserved as null in JSON."""
         resp = client.get("/api/history?addr=1&hours=1")
@@ -152,6 +209,89 @@ class TestApiRange:
         assert data["max"] is None
 
 
+class TestRevalidation:
+    """ETag handling on the polled JSON endpoints."""
+
+    def test_unchanged_data_returns_304(self, client):
+        """A matching If-None-Match gets 304 with no body."""
+        resp = client.get("/api/current")
+        etag = resp.headers["ETag"]
+        again = client.get("/api/current", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.data == b""
+        assert again.headers["ETag"] == etag
+
+    def test_etag_is_weak(self, client):
+        """The gzip and identity bodies share one tag, so it must be weak."""
+        resp = client.get("/api/current")
+        assert resp.headers["ETag"].startswith('W/"')
+
+    def test_new_row_changes_etag(self, sample_db):
+        """Inserting a reading invalidates the previous ETag."""
+        client = create_app(sample_db).test_client()
+        etag = client.get("/api/sensors").headers["ETag"]
+        conn = sqlite3.connect(sample_db)
+        conn.execute(
+            "INSERT INTO readings (ts, addr, temp_0, temp_1, temp_2, temp_3)"
+            " VALUES (1717243290, 3, 100, NULL, NULL, NULL)"
+        )
+        conn.commit()
+        conn.close()
+        resp = client.get("/api/sensors", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert json.loads(resp.data) == [1, 2, 3]
+        assert resp.headers["ETag"] != etag
+
+    def test_version_probe_does_not_scan(self, sample_db):
+        """The ETag query seeks both ends of the rowid B-tree, no scan."""
+        conn = sqlite3.connect(sample_db)
+        plan = [row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + _VERSION)]
+        conn.close()
+        assert not [step for step in plan if step.startswith("SCAN readings")]
+        assert [step for step in plan if step.startswith("SEARCH readings")]
+
+    def test_errors_are_not_tagged(self, client):
+        """A 400 response carries no ETag."""
+        resp = client.get("/api/history?hours=1")
+        assert resp.status_code == 400
+        assert "ETag" not in resp.headers
+
+
+class TestCompression:
+    """gzip Content-Encoding on API responses."""
+
+    def test_json_gzipped_when_accepted(self, empty_db):
+        """A large JSON body is gzipped and decodes to the plain one."""
+        _insert_series(empty_db, list(range(2000)))
+        with create_app(empty_db).test_client() as c:
+            url = "/api/history?addr=1&hours=24"
+            plain = c.get(url)
+            packed = c.get(url, headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.headers["Vary"]
+        assert packed.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in packed.headers["Vary"]
+        assert gzip.decompress(packed.data) == plain.data
+
+    def test_streamed_csv_gzipped(self, empty_db):
+        """The streamed CSV export is gzipped chunk by chunk."""
+        _insert_series(empty_db, list(range(2000)))
+        with create_app(empty_db).test_client() as c:
+            url = "/api/export?addr=1&hours=24"
+            plain = c.get(url)
+            packed = c.get(url, headers={"Accept-Encoding": "gzip"})
+        assert packed.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(packed.data) == plain.data
+
+    def test_small_body_left_alone(self, client):
+        """Bodies under the threshold are sent uncompressed."""
+        resp = client.get("/api/sensors", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in resp.headers
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert json.loads(resp.data) == [1, 2]
+
+
 class TestApiExport:
     """GET /api/export endpoint."""
 
@@ -191,6 +331,16 @@ class TestApiExport:
         for row in rows[1:]:
             assert row[4] == ""  # temp_3 column
 
+    def test_streams_many_rows(self, empty_db):
+        """An export larger than one chunk arrives whole and in order."""
+        _insert_series(empty_db, list(range(2000)))
+        app = create_app(empty_db)
+        with app.test_client() as c:
+            resp = c.get("/api/export?addr=1&hours=24")
+        rows = list(csv.reader(io.StringIO(resp.data.decode())))
+        assert len(rows) == 2001
+        assert [int(r[1]) for r in rows[1:]] == list(range(2000))
+
     def test_unknown_node(self, client):
         """Unknown node returns header-only CSV."""
         resp = client.get("/api/export?addr=99&hours=24")
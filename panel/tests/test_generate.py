@@ -5,9 +5,26 @@ import sqlite3
 import tempfile
 from unittest.mock import patch
 
+import pytest
+
 from generate_data import generate
 
 
+@pytest.fixture(scope="module")
+def week_db():
+    """Generate one week of seeded data once and return a connection to it.
+
+    Shared by the whole module: tests using it must not write.
+    """
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    generate(path, 7, 42)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+    os.unlink(path)
+
+
 class TestGenerate:
     """Verify mock data generation produces valid, realistic data."""
 
@@ -21,88 +38,60 @@ class TestGenerate:
         finally:
             os.unlink(path)
 
-    def test_temperature_ranges(self):
+    def test_temperature_ranges(self, week_db):
         """All non-null temperatures fall within a plausible range."""
-        fd, path = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
-        try:
-            generate(path, 7, 42)
-            conn = sqlite3.connect(path)
-            for col in ("temp_0", "temp_1", "temp_2", "temp_3"):
-                row = conn.execute(
-                    "SELECT MIN(%s), MAX(%s) FROM readings"
-                    " WHERE %s IS NOT NULL" % (col, col, col)
-                ).fetchone()
-                if row[0] is not None:
-                    # -20C to 60C in tenths
-                    assert row[0] >= -200, "%s min too low: %d" % (col, row[0])
-                    assert row[1] <= 600, "%s max too high: %d" % (col, row[1])
-            conn.close()
-        finally:
-            os.unlink(path)
+        for col in ("temp_0", "temp_1", "temp_2", "temp_3"):
+            row = week_db.execute(
+                "SELECT MIN(%s), MAX(%s) FROM readings"
+                " WHERE %s IS NOT NULL" % (col, col, col)
+            ).fetchone()
+            if row[0] is not None:
+                # -20C to 60C in tenths
+                assert row[0] >= -200, "%s min too low: %d" % (col, row[0])
+                assert row[1] <= 600, "%s max too high: %d" % (col, row[1])
 
-    def test_timestamps_ordered(self):
+    def test_timestamps_ordered(self, week_db):
         """Timestamps within each client are strictly non-decreasing."""
-        fd, path = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
-        try:
-            generate(path, 3, 42)
-            conn = sqlite3.connect(path)
-            conn.row_factory = sqlite3.Row
-            for addr in (1, 2, 3):
-                rows = conn.execute(
-                    "SELECT ts FROM readings WHERE addr = ?"
-                    " ORDER BY id", (addr,)
-                ).fetchall()
-                for i in range(1, len(rows)):
-                    assert rows[i]["ts"] >= rows[i - 1]["ts"]
-            conn.close()
-        finally:
-            os.unlink(path)
+        for addr in (1, 2, 3):
+            ts = [t for (t,) in week_db.execute(
+                "SELECT ts FROM readings WHERE addr = ? ORDER BY id", (addr,)
+            )]
+            assert ts == sorted(ts)
 
-    def test_null_presence(self):
+    def test_null_presence(self, week_db):
         """Client 3 channel 1 has some NULL values."""
-        fd, path = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
-        try:
-            generate(path, 30, 42)
-            conn = sqlite3.connect(path)
-            null_count = conn.execute(
-                "SELECT COUNT(*) FROM readings"
-                " WHERE addr = 3 AND temp_1 IS NULL"
-            ).fetchone()[0]
-            total = conn.execute(
-                "SELECT COUNT(*) FROM readings WHERE addr = 3"
-            ).fetchone()[0]
-            conn.close()
-            # Expect roughly 5% nulls; check at least some exist
-            assert null_count > 0
-            assert null_count < total
-        finally:
-            os.unlink(path)
+        null_count = week_db.execute(
+            "SELECT COUNT(*) FROM readings"
+            " WHERE addr = 3 AND temp_1 IS NULL"
+        ).fetchone()[0]
+        total = week_db.execute(
+            "SELECT COUNT(*) FROM readings WHERE addr = 3"
+        ).fetchone()[0]
+        # Expect roughly 5% nulls; check at least some exist
+        assert null_count > 0
+        assert null_count < total
 
-    def test_unused_channels_are_null(self):
+    def test_unused_channels_are_null(self, week_db):
         """Channels beyond a client's count are always NULL."""
-        fd, path = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
-        try:
-            generate(path, 1, 42)
-            conn = sqlite3.connect(path)
-            # Client 2 has 3 channels: temp_3 should always be NULL
-            non_null = conn.execute(
-                "SELECT COUNT(*) FROM readings"
-                " WHERE addr = 2 AND temp_3 IS NOT NULL"
-            ).fetchone()[0]
-            assert non_null == 0
-            # Client 3 has 2 channels: temp_2 and temp_3 always NULL
-            non_null = conn.execute(
-                "SELECT COUNT(*) FROM readings"
-                " WHERE addr = 3 AND temp_2 IS NOT NULL"
-            ).fetchone()[0]
-            assert non_null == 0
-            conn.close()
-        finally:
-            os.unlink(path)
+        # Client 2 has 3 channels: temp_3 should always be NULL
+        non_null = week_db.execute(
+            "SELECT COUNT(*) FROM readings"
+            " WHERE addr = 2 AND temp_3 IS NOT NULL"
+        ).fetchone()[0]
+        assert non_null == 0
+        # Client 3 has 2 channels: temp_2 and temp_3 always NULL
+        non_null = week_db.execute(
+            "SELECT COUNT(*) FROM readings"
+            " WHERE addr = 3 AND (temp_2 IS NOT NULL OR temp_3 IS NOT NULL)"
+        ).fetchone()[0]
+        assert non_null == 0
+
+    def test_indexes_rebuilt(self, week_db):
+        """The schema's indexes exist once generation finishes."""
+        names = [name for (name,) in week_db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )]
+        assert "idx_readings_addr_ts" in names
 
     def test_reproducible_with_seed(self):
         """Same seed produces identical data."""
@@ -9,6 +9,10 @@ import tomllib
 # Receive timeout in milliseconds for bus communication.
 TIMEOUT_MS = 200
 
+# Scalar keys of the [rs485] section and their required types, in the
+# order they are checked.
+_RS485_KEYS = (("interval", int), ("port", str), ("baudrate", int))
+
 
 def load_config(path: str, transport: str) -> dict:
     """Read a TOML config file and validate required keys.
@@ -31,7 +35,7 @@ def load_config(path: str, transport: str) -> dict:
     with open(path, "rb") as f:
         raw = tomllib.load(f)
 
-    _require_str(raw, "db")
+    _require(raw, "db", str)
 
     result = {
         "transport": transport,
@@ -46,13 +50,10 @@ def load_config(path: str, transport: str) -> dict:
         if not isinstance(section, dict):
             raise ValueError("rs485 transport requires [rs485] section")
         _require_clients(section)
-        _require_int(section, "interval")
-        _require_str(section, "port")
-        _require_int(section, "baudrate")
         result["clients"] = section["clients"]
-        result["interval"] = section["interval"]
-        result["port"] = section["port"]
-        result["baudrate"] = section["baudrate"]
+        for key, typ in _RS485_KEYS:
+            _require(section, key, typ)
+            result[key] = section[key]
 
     return result
 
@@ -85,17 +86,10 @@ def _require_wifi_section(raw: dict[str, object]) -> None:
         raise ValueError("wifi.port must be int, got %s" % type(wifi["port"]).__name__)
 
 
-def _require_str(raw: dict[str, object], key: str) -> None:
-    """Validate that *key* exists in *raw* and is a str."""
-    if key not in raw:
-        raise ValueError("missing required key: %s" % key)
-    if not isinstance(raw[key], str):
-        raise ValueError("%s must be str, got %s" % (key, type(raw[key]).__name__))
-
-
-def _require_int(raw: dict[str, object], key: str) -> None:
-    """Validate that *key* exists in *raw* and is an int."""
+def _require(raw: dict[str, object], key: str, typ: type) -> None:
+    """Validate that *key* exists in *raw* and is an instance of *typ*."""
     if key not in raw:
         raise ValueError("missing required key: %s" % key)
-    if not isinstance(raw[key], int):
-        raise ValueError("%s must be int, got %s" % (key, type(raw[key]).__name__))
+    if not isinstance(raw[key], typ):
+        raise ValueError("%s must be %s, got %s"
+                         % (key, typ.__name__, type(raw[key]).__name__))
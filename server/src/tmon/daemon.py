@@ -12,6 +12,7 @@ import argparse
 import logging
 import signal
 import threading
+import time
 
 from tmon.config import load_config
 from tmon.paths import resolve_config, resolve_db
@@ -23,6 +24,9 @@ from tmon.udp_receiver import UDPReceiver
 
 _RETENTION_DAYS = 365
 
+# Most pushed frames stored per commit in the listener loop.
+_MAX_BATCH = 32
+
 log = logging.getLogger(__name__)
 
 _shutdown = threading.Event()
@@ -36,11 +40,14 @@ def _on_signal(signum: int, frame) -> None:
 def run_poller(cfg: dict, bus, storage, shutdown: threading.Event) -> int:
     """Run the poll loop until *shutdown* is set.
 
-    Polls all clients, sleeps for ``cfg["interval"]`` seconds, and
-    repeats.  Returns the number of completed cycles.
+    Starts a cycle every ``cfg["interval"]`` seconds, measured from
+    the start of the previous one, so the time spent polling does not
+    stretch the period.  A cycle that overruns the interval is followed
+    immediately by the next.  Returns the number of completed cycles.
     """
     poller = Poller(bus, storage, cfg["clients"])
     cycles = 0
+    deadline = time.monotonic()
 
     while not shutdown.is_set():
         results = poller.poll_all()
@@ -49,9 +56,13 @@ def run_poller(cfg: dict, bus, storage, shutdown: threading.Event) -> int:
             "cycle %d: %d/%d clients responded",
             cycles, len(results), len(cfg["clients"]),
         )
-        remaining = cfg["interval"]
+        deadline += cfg["interval"]
+        remaining = deadline - time.monotonic()
         if remaining > 0:
             shutdown.wait(remaining)
+        else:
+            # Overran: start afresh rather than bursting to catch up.
+            deadline = time.monotonic()
 
     return cycles
 
@@ -59,17 +70,16 @@ def run_poller(cfg: dict, bus, storage, shutdown: threading.Event) -> int:
 def run_listener(receiver, storage, shutdown: threading.Event) -> int:
     """Run the push receiver loop until *shutdown* is set.
 
-    Receives readings pushed by clients via UDP and stores them.
-    Returns the number of readings received.
+    Receives readings pushed by clients via UDP and stores them,
+    draining any queued frames into a single commit.  Returns the
+    number of readings received.
     """
     listener = UDPListener(receiver, storage)
     count = 0
 
     while not shutdown.is_set():
         # Use timeout so we check shutdown flag periodically
-        reading = listener.receive(0.5)
-        if reading is not None:
-            count += 1
+        count += len(listener.receive_batch(0.5, _MAX_BATCH))
 
     return count
 
@@ -19,6 +19,12 @@ PROTO_TEMP_INVALID = 0x7FFF
 PROTO_ADDR_MIN = 1
 PROTO_ADDR_MAX = 247
 
+# Frame header (START, ADDR, CMD, LEN) and trailing little-endian CRC.
+_HEADER = struct.Struct("<BBBB")
+_CRC = struct.Struct("<H")
+# REPLY payload: four int16-LE temperatures.
+_REPLY = struct.Struct("<hhhh")
+
 
 def is_valid_address(addr: int) -> bool:
     """Check whether *addr* is in the valid range (1-247)."""
@@ -36,21 +42,33 @@ class Frame:
 # -- CRC-16/MODBUS -----------------------------------------------------------
 
 
+def _crc16_table() -> tuple[int, ...]:
+    """Build the 256-entry lookup table for reflected polynomial 0xA001."""
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _crc16_table()
+
+
 def crc16_modbus(data: bytes) -> int:
     """Compute CRC-16/MODBUS over a byte sequence.
 
     Uses polynomial 0x8005 with initial value 0xFFFF and reflected
-    input/output (standard MODBUS CRC).  Bitwise implementation --
-    simple and sufficient for our short frames.
+    input/output (standard MODBUS CRC).  Table-driven: one lookup per
+    byte instead of eight shift/xor steps.
     """
     crc = 0xFFFF
     for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x0001:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
+        crc = (crc >> 8) ^ _CRC16_TABLE[(crc ^ byte) & 0xFF]
     return crc
 
 
@@ -72,9 +90,9 @@ def encode_frame(addr: int, cmd: int, payload: bytes) -> bytes:
                 PROTO_ADDR_MIN, PROTO_ADDR_MAX, addr
             )
         )
-    body = bytes([addr, cmd, len(payload)]) + payload
-    crc = crc16_modbus(body)
-    return bytes([PROTO_START]) + body + struct.pack("<H", crc)
+    header = _HEADER.pack(PROTO_START, addr, cmd, len(payload))
+    crc = crc16_modbus(header[1:] + payload)
+    return header + payload + _CRC.pack(crc)
 
 
 # -- Decoding ----------------------------------------------------------------
@@ -84,6 +102,8 @@ def decode_frame(data: bytes) -> Frame:
     """Parse raw bytes into a Frame.
 
     Validates the frame structure, length field, address range, and CRC.
+    The cheap header checks run first so malformed input is rejected
+    before any CRC work.
 
     Raises:
         ValueError: On any validation failure (short frame, bad START byte,
@@ -94,45 +114,42 @@ def decode_frame(data: bytes) -> Frame:
             "frame too short: {} bytes, minimum is 6".format(len(data))
         )
 
-    if data[0] != PROTO_START:
+    start, addr, cmd, payload_len = _HEADER.unpack_from(data)
+
+    if start != PROTO_START:
         raise ValueError(
             "bad START byte: expected 0x{:02X}, got 0x{:02X}".format(
-                PROTO_START, data[0]
+                PROTO_START, start
             )
         )
 
-    addr = data[1]
-    cmd = data[2]
-    payload_len = data[3]
-
-    if len(data) != 4 + payload_len + 2:
+    end = 4 + payload_len
+    if len(data) != end + 2:
         raise ValueError(
             "length mismatch: LEN field says {} payload bytes, "
             "but frame is {} bytes (expected {})".format(
-                payload_len, len(data), 4 + payload_len + 2
+                payload_len, len(data), end + 2
             )
         )
 
-    payload = data[4 : 4 + payload_len]
-    crc_received = struct.unpack_from("<H", data, 4 + payload_len)[0]
-    body = data[1 : 4 + payload_len]
-    crc_computed = crc16_modbus(body)
-
-    if crc_received != crc_computed:
+    if not is_valid_address(addr):
         raise ValueError(
-            "CRC mismatch: received 0x{:04X}, computed 0x{:04X}".format(
-                crc_received, crc_computed
+            "addr out of range: {} (must be {}-{})".format(
+                addr, PROTO_ADDR_MIN, PROTO_ADDR_MAX
             )
         )
 
-    if not is_valid_address(addr):
+    crc_received = _CRC.unpack_from(data, end)[0]
+    crc_computed = crc16_modbus(data[1:end])
+
+    if crc_received != crc_computed:
         raise ValueError(
-            "addr out of range: {} (must be {}-{})".format(
-                addr, PROTO_ADDR_MIN, PROTO_ADDR_MAX
+            "CRC mismatch: received 0x{:04X}, computed 0x{:04X}".format(
+                crc_received, crc_computed
             )
         )
 
-    return Frame(addr, cmd, payload)
+    return Frame(addr, cmd, bytes(data[4:end]))
 
 
 def parse_reply(payload: bytes) -> list[int | None]:
@@ -155,12 +172,7 @@ def parse_reply(payload: bytes) -> list[int | None]:
             )
         )
 
-    temperatures = []
-    for i in range(4):
-        raw = struct.unpack_from("<h", payload, i * 2)[0]
-        if raw != PROTO_TEMP_INVALID:
-            temperatures.append(raw)
-        else:
-            temperatures.append(None)
-
-    return temperatures
+    return [
+        None if raw == PROTO_TEMP_INVALID else raw
+        for raw in _REPLY.unpack(payload)
+    ]
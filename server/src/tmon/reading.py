@@ -20,6 +20,11 @@ class Reading:
     temp_2: int | None
     temp_3: int | None
 
+    @property
+    def temps(self) -> tuple[int | None, ...]:
+        """All four channel temperatures, in channel order."""
+        return (self.temp_0, self.temp_1, self.temp_2, self.temp_3)
+
 
 def fmt_temp(t: int | None) -> str:
     """Format a raw int16 temperature for display."""
@@ -5,6 +5,7 @@ and stores raw int16 temperature readings in Storage.
 """
 
 import logging
+import time
 
 from tmon.protocol import (
     encode_frame,
@@ -28,12 +29,10 @@ class Poller:
 
     Args:
         bus: Object with ``send(data)`` and ``receive()`` methods.
-        storage: Object with ``insert(addr, temps)``.
+        storage: Object with ``insert_many(readings)`` and ``commit()``.
         clients: List of integer client addresses to poll.
     """
 
-
-
     def __init__(self, bus, storage, clients: list[int]):
         """Initialize the poller."""
         self._bus = bus
@@ -101,22 +100,19 @@ class Poller:
     def poll_all(self) -> list[Reading]:
         """Poll all clients and store successful readings.
 
+        Each reading is stamped when its reply arrives; the cycle is
+        stored and committed once at the end.
+
         Returns:
             list[Reading]: Readings collected this cycle.
         """
         results = []
+        stamped = []
         for addr in self._clients:
             reading = self.poll(addr)
             if reading is not None:
-                self._storage.insert(
-                    reading.addr,
-                    [
-                        reading.temp_0,
-                        reading.temp_1,
-                        reading.temp_2,
-                        reading.temp_3,
-                    ],
-                )
                 results.append(reading)
+                stamped.append((int(time.time()), reading))
+        self._storage.insert_many(stamped)
         self._storage.commit()
         return results
@@ -11,6 +11,8 @@ import sqlite3
 import time
 from pathlib import Path
 
+from tmon.reading import Reading
+
 
 log = logging.getLogger(__name__)
 
@@ -37,13 +39,16 @@ _FETCH_RECENT = """\
 SELECT id, ts, addr, temp_0, temp_1, temp_2, temp_3
 FROM readings ORDER BY id DESC LIMIT ?"""
 
+_PURGE = "DELETE FROM readings WHERE ts < ?"
+
 
 class Storage:
     """SQLite-backed storage for temperature readings.
 
     Opens (or creates) the database at *db_path*, creates the
     ``readings`` table if absent, and enables WAL journaling for
-    concurrent-read safety.
+    concurrent-read safety.  With WAL, ``synchronous=NORMAL`` is still
+    crash-safe and avoids an fsync on every commit.
 
     Args:
         db_path: Path to the SQLite database file, or ``":memory:"``.
@@ -56,6 +61,7 @@ class Storage:
         self._conn = sqlite3.connect(db_path)
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._conn.executescript(SCHEMA)
         self._conn.commit()
 
@@ -75,6 +81,16 @@ class Storage:
         ts = int(time.time())
         self._conn.execute(_INSERT, (ts, addr) + tuple(temps))
 
+    def insert_many(self, readings: list[tuple[int, Reading]]) -> None:
+        """Insert ``(ts, reading)`` pairs with a single ``executemany``.
+
+        Each row keeps the timestamp it was given, taken when its reply
+        arrived.  Does not commit; call ``commit()`` afterwards.
+        """
+        self._conn.executemany(
+            _INSERT, [(ts, r.addr) + r.temps for ts, r in readings]
+        )
+
     def fetch(self, count: int) -> list[dict]:
         """Return the newest *count* readings, newest first."""
         cursor = self._conn.execute(_FETCH_RECENT, (count,))
@@ -96,9 +112,7 @@ class Storage:
         Returns the number of deleted rows.
         """
         cutoff = int(time.time()) - days * 86400
-        cursor = self._conn.execute(
-            "DELETE FROM readings WHERE ts < ?", (cutoff,)
-        )
+        cursor = self._conn.execute(_PURGE, (cutoff,))
         deleted = cursor.rowcount
         self._conn.commit()
         if deleted > 0:
@@ -24,7 +24,8 @@ class UDPListener:
     and stores them.
 
     Args:
-        receiver: Object with ``recv(timeout_s)`` method.
+        receiver: Object with ``recv(timeout_s)`` and
+            ``recv_batch(timeout_s, max_frames)`` methods.
         storage: Object with ``insert(addr, temps)`` and ``commit()``.
     """
 
@@ -46,10 +47,33 @@ class UDPListener:
         if not raw:
             return None
 
-        return self._process_frame(raw)
+        reading = self._process_frame(raw)
+        if reading is not None:
+            self._storage.commit()
+        return reading
+
+    def receive_batch(self, timeout_s: float, max_frames: int) -> list[Reading]:
+        """Receive one frame, then drain any already queued, and commit once.
+
+        Waits up to *timeout_s* for the first frame.  Further frames are
+        read without waiting until the receiver is empty or *max_frames*
+        have been read.  Bad frames are skipped.
+
+        Returns:
+            Readings stored by this call (possibly empty).
+        """
+        readings = []
+        for raw in self._receiver.recv_batch(timeout_s, max_frames):
+            reading = self._process_frame(raw)
+            if reading is not None:
+                readings.append(reading)
+
+        if readings:
+            self._storage.commit()
+        return readings
 
     def _process_frame(self, raw: bytes) -> Reading | None:
-        """Decode frame, store reading, update last-seen."""
+        """Decode frame and insert the reading; does not commit."""
         try:
             frame = decode_frame(raw)
         except ValueError as exc:
@@ -83,6 +107,5 @@ class UDPListener:
         )
 
         self._storage.insert(addr, temps)
-        self._storage.commit()
 
         return reading
@@ -2,29 +2,47 @@
 
 Clients push REPLY frames via UDP; server just listens and stores.
 No connection state, no polling -- clients control timing.
+
+The socket asks for a larger receive buffer so bursts queue in the
+kernel instead of being dropped.  Linux caps the request at
+net.core.rmem_max; raise that sysctl to let the full size through.
 """
 
+import logging
+import selectors
 import socket
 
+log = logging.getLogger(__name__)
+
 
 class UDPReceiver:
     """UDP socket for receiving client readings.
 
     Binds to a UDP port and receives frames pushed by clients.
     Each frame is a complete protocol REPLY (START, ADDR, CMD, LEN,
-    payload, CRC).
+    payload, CRC).  The socket is non-blocking and registered once
+    with a selector; datagrams are read into a reusable buffer.
 
     Args:
         port: UDP port to listen on.
     """
 
     _MAX_FRAME = 64
+    _RCVBUF = 1 << 20
 
     def __init__(self, port: int):
         """Bind to the UDP port and start listening."""
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                              self._RCVBUF)
+        log.debug("receive buffer: %d bytes",
+                  self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF))
         self._sock.bind(("0.0.0.0", port))
+        self._sock.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self._sock, selectors.EVENT_READ)
+        self._buf = bytearray(self._MAX_FRAME)
 
     def recv(self, timeout_s: float) -> bytes:
         """Receive with timeout.
@@ -35,16 +53,35 @@ class UDPReceiver:
         Returns:
             The raw frame bytes, or empty bytes on timeout/error.
         """
-        self._sock.settimeout(timeout_s)
-        try:
-            data, _ = self._sock.recvfrom(self._MAX_FRAME)
-            return data
-        except socket.timeout:
+        if not self._sel.select(timeout_s):
             return b""
+        try:
+            n = self._sock.recv_into(self._buf)
         except OSError:
             return b""
-        finally:
-            self._sock.settimeout(None)
+        return bytes(self._buf[:n])
+
+    def recv_batch(self, timeout_s: float, max_frames: int) -> list[bytes]:
+        """Wait for a datagram, then read every one already queued.
+
+        Waits up to *timeout_s* for the first datagram, then reads
+        without waiting until the socket is empty or *max_frames* have
+        been read, so a burst costs one select rather than one per
+        datagram.
+
+        Returns:
+            The raw frames in arrival order; empty on timeout.
+        """
+        frames = []
+        if not self._sel.select(timeout_s):
+            return frames
+        while len(frames) < max_frames:
+            try:
+                n = self._sock.recv_into(self._buf)
+            except OSError:
+                break
+            frames.append(bytes(self._buf[:n]))
+        return frames
 
     def __enter__(self) -> "UDPReceiver":
         return self
@@ -53,7 +90,8 @@ class UDPReceiver:
         self.close()
 
     def close(self) -> None:
-        """Close the socket."""
+        """Close the selector and the socket."""
+        self._sel.close()
         try:
             self._sock.close()
         except OSError:
@@ -1,8 +1,16 @@
-"""Shared pytest fixtures for tmon tests."""
+"""Shared pytest fixtures and test doubles for tmon tests."""
 
+import socket
 import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
 
 from tmon.protocol import encode_frame, PROTO_CMD_REPLY
+from tmon.storage import Storage
 
 
 def make_reply(addr: int, t0: int, t1: int, t2: int, t3: int) -> bytes:
@@ -11,12 +19,66 @@ def make_reply(addr: int, t0: int, t1: int, t2: int, t3: int) -> bytes:
     return encode_frame(addr, PROTO_CMD_REPLY, payload)
 
 
+# One sender socket and one sender thread for every UDP test datagram;
+# both are released at session end.
+_TX_SOCK = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+_TX_POOL = ThreadPoolExecutor(max_workers=1)
+
+
+def send_udp(port: int, data: bytes) -> None:
+    """Send a UDP datagram to localhost:port."""
+    _TX_SOCK.sendto(data, ("127.0.0.1", port))
+
+
+def send_udp_later(port: int, frames: list[bytes], delay_s: float) -> Future:
+    """Send *frames* back to back to localhost:*port* after *delay_s*.
+
+    Runs on the shared sender thread so the caller can block in recv
+    meanwhile.  Call result() on the returned future to wait for it.
+    """
+    def send() -> None:
+        """Wait *delay_s*, then send each frame in order."""
+        time.sleep(delay_s)
+        for data in frames:
+            send_udp(port, data)
+
+    return _TX_POOL.submit(send)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _close_tx_sock():
+    """Shut down the sender thread and socket after the test session."""
+    yield
+    _TX_POOL.shutdown()
+    _TX_SOCK.close()
+
+
+@pytest.fixture(scope="module")
+def _module_storage():
+    """One in-memory Storage shared by every test in a module."""
+    storage = Storage(":memory:")
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def store(_module_storage):
+    """Yield the module's shared Storage, emptied after each test."""
+    yield _module_storage
+    _module_storage._conn.execute("DELETE FROM readings")
+    _module_storage.commit()
+
+
 class FakeBus:
-    """Test double for Bus: canned responses, records sent data."""
+    """Test double for SerialBus: canned responses, records sent data.
+
+    Implements the same ``send``/``receive``/``close`` surface as
+    ``SerialBus`` so poll semantics can be tested without a PTY.
+    """
 
     def __init__(self, responses: list[bytes]):
         """Initialize with canned responses."""
-        self._responses = list(responses)
+        self._responses = deque(responses)
         self.sent = []
 
     def send(self, data: bytes) -> None:
@@ -26,5 +88,81 @@ class FakeBus:
     def receive(self) -> bytes:
         """Return the next canned response, or empty bytes if exhausted."""
         if self._responses:
-            return self._responses.pop(0)
+            return self._responses.popleft()
+        return b""
+
+    def close(self) -> None:
+        """No-op; there is no underlying port."""
+        pass
+
+
+class CountingBus:
+    """Test double: cycles through replies, triggers shutdown after max_sends."""
+
+    def __init__(self, replies: list[bytes], max_sends: int,
+                 shutdown: threading.Event):
+        """Initialize with reply rotation, send limit, and shutdown event."""
+        self._replies = deque(replies)
+        self._max_sends = max_sends
+        self._shutdown = shutdown
+        self.send_count = 0
+
+    def send(self, data: bytes) -> None:
+        """Record send; trigger shutdown when limit reached."""
+        self.send_count += 1
+        if self.send_count >= self._max_sends:
+            self._shutdown.set()
+
+    def receive(self) -> bytes:
+        """Return the next reply in rotation."""
+        reply = self._replies[0]
+        self._replies.rotate(-1)
+        return reply
+
+    def close(self) -> None:
+        """No-op; there is no underlying port."""
+        pass
+
+
+class FakeReceiver:
+    """Test double for UDPReceiver: returns pre-configured frames."""
+
+    def __init__(self, frames: list[bytes]):
+        """Initialize with canned frames."""
+        self._frames = deque(frames)
+
+    def recv(self, timeout_s: float) -> bytes:
+        """Return the next frame, or empty bytes if exhausted."""
+        if self._frames:
+            return self._frames.popleft()
         return b""
+
+    def recv_batch(self, timeout_s: float, max_frames: int) -> list[bytes]:
+        """Return up to max_frames of the remaining frames."""
+        frames = []
+        while self._frames and len(frames) < max_frames:
+            frames.append(self._frames.popleft())
+        return frames
+
+
+class CountingReceiver:
+    """Test double: returns a canned frame, triggers shutdown at max_recvs."""
+
+    def __init__(self, frame: bytes, max_recvs: int,
+                 shutdown: threading.Event):
+        """Initialize with canned frame, receive limit, and shutdown event."""
+        self._frame = frame
+        self._max_recvs = max_recvs
+        self._shutdown = shutdown
+        self.recv_count = 0
+
+    def recv(self, timeout_s: float) -> bytes:
+        """Return the canned frame; trigger shutdown when limit reached."""
+        self.recv_count += 1
+        if self.recv_count >= self._max_recvs:
+            self._shutdown.set()
+        return self._frame
+
+    def recv_batch(self, timeout_s: float, max_frames: int) -> list[bytes]:
+        """Return the canned frame as a batch of one."""
+        return [self.recv(timeout_s)]
@@ -1,57 +1,15 @@
 """Tests for tmon.daemon."""
 
 import threading
+import types
 
 import tmon.daemon as daemon_mod
-from conftest import FakeBus, make_reply
+from conftest import CountingBus, CountingReceiver, FakeBus, make_reply
 from tmon.daemon import run_poller, run_listener, _on_signal
 from tmon.protocol import PROTO_TEMP_INVALID
 from tmon.storage import Storage
 
 
-class CountingBus:
-    """Test double: counts sends, triggers shutdown after max_polls."""
-
-    def __init__(self, reply: bytes, max_polls: int, shutdown: threading.Event):
-        """Initialize with canned reply, send limit, and shutdown event."""
-        self._reply = reply
-        self._max_polls = max_polls
-        self._shutdown = shutdown
-        self.send_count = 0
-
-    def send(self, data: bytes) -> None:
-        """Record send; trigger shutdown when limit reached."""
-        self.send_count += 1
-        if self.send_count >= self._max_polls:
-            self._shutdown.set()
-
-    def receive(self) -> bytes:
-        """Return the canned reply."""
-        return self._reply
-
-    def close(self) -> None:
-        """No-op for test compatibility."""
-        pass
-
-
-class CountingReceiver:
-    """Test double: returns canned frames via recv(), triggers shutdown at limit."""
-
-    def __init__(self, frame: bytes, max_recvs: int, shutdown: threading.Event):
-        """Initialize with canned frame, receive limit, and shutdown event."""
-        self._frame = frame
-        self._max_recvs = max_recvs
-        self._shutdown = shutdown
-        self.recv_count = 0
-
-    def recv(self, timeout_s: float) -> bytes:
-        """Return the canned frame; trigger shutdown when limit reached."""
-        self.recv_count += 1
-        if self.recv_count >= self._max_recvs:
-            self._shutdown.set()
-        return self._frame
-
-
 class TestRunPoller:
     """Tests for the daemon run_poller() function."""
 
@@ -60,7 +18,7 @@ class TestRunPoller:
         shutdown = threading.Event()
         reply = make_reply(3, 250, PROTO_TEMP_INVALID,
                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
-        bus = CountingBus(reply, 2, shutdown)
+        bus = CountingBus([reply], 2, shutdown)
         storage = Storage(":memory:")
         cfg = {"clients": [3], "interval": 0}
 
@@ -101,35 +59,7 @@ class TestRunPoller:
         reply2 = make_reply(2, 200, PROTO_TEMP_INVALID,
                              PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
 
-        class MultiBus:
-            """Test double: cycles through replies, shuts down at limit."""
-
-            def __init__(self, replies: list[bytes], max_sends: int,
-                         shutdown_ev: threading.Event):
-                """Initialize with reply list, send limit, and shutdown event."""
-                self._replies = replies
-                self._idx = 0
-                self._max = max_sends
-                self._sends = 0
-                self._shutdown = shutdown_ev
-
-            def send(self, data: bytes) -> None:
-                """Record send; trigger shutdown at limit."""
-                self._sends += 1
-                if self._sends >= self._max:
-                    self._shutdown.set()
-
-            def receive(self) -> bytes:
-                """Return next reply in rotation."""
-                r = self._replies[self._idx % len(self._replies)]
-                self._idx += 1
-                return r
-
-            def close(self) -> None:
-                """No-op for test compatibility."""
-                pass
-
-        bus = MultiBus([reply1, reply2], 4, shutdown)
+        bus = CountingBus([reply1, reply2], 4, shutdown)
         storage = Storage(":memory:")
         cfg = {"clients": [1, 2], "interval": 0}
 
@@ -140,6 +70,43 @@ class TestRunPoller:
         assert len(rows) >= 2
         storage.close()
 
+    def test_interval_counts_from_cycle_start(self, monkeypatch):
+        """Time spent polling is taken off the wait before the next cycle."""
+        now = [1000.0]
+        waits = []
+
+        class ClockEvent(threading.Event):
+            """Event whose wait() records the timeout and advances the clock."""
+
+            def wait(self, timeout: float) -> bool:
+                """Record *timeout* and move the fake clock past it."""
+                waits.append(timeout)
+                now[0] += timeout
+                return self.is_set()
+
+        class SlowBus(CountingBus):
+            """CountingBus where every poll takes 3 s of fake time."""
+
+            def send(self, data: bytes) -> None:
+                """Advance the clock, then count the send."""
+                now[0] += 3
+                super().send(data)
+
+        monkeypatch.setattr(daemon_mod, "time",
+                            types.SimpleNamespace(monotonic=lambda: now[0]))
+        shutdown = ClockEvent()
+        reply = make_reply(1, 100, PROTO_TEMP_INVALID,
+                           PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+        bus = SlowBus([reply], 3, shutdown)
+        storage = Storage(":memory:")
+        cfg = {"clients": [1], "interval": 10}
+
+        cycles = run_poller(cfg, bus, storage, shutdown)
+
+        assert cycles == 3
+        assert waits == [7, 7, 7]
+        storage.close()
+
 
 class TestRunListener:
     """Tests for the daemon run_listener() function."""
@@ -55,6 +55,19 @@ class TestIsValidAddress:
 # -- CRC known vectors from protocol.org -------------------------------------
 
 
+def _crc16_bitwise(data: bytes) -> int:
+    """Reference bit-at-a-time CRC-16/MODBUS."""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return crc
+
+
 class TestCrc16Modbus:
     """CRC-16/MODBUS computation tests."""
 
@@ -80,6 +93,13 @@ class TestCrc16Modbus:
         assert result != 0xFFFF
         assert 0 <= result <= 0xFFFF
 
+    def test_matches_bitwise_reference(self):
+        """Table-driven CRC agrees with the bitwise definition."""
+        rng = random.Random(7)
+        for _ in range(200):
+            data = rng.randbytes(rng.randint(0, 32))
+            assert crc16_modbus(data) == _crc16_bitwise(data)
+
 
 # -- encode_frame ----------------------------------------------------------
 
@@ -189,6 +209,14 @@ class TestDecodeFrame:
         frame = decode_frame(raw)
         assert isinstance(frame, Frame)
 
+    def test_accepts_memoryview(self):
+        """Any bytes-like input decodes; the payload comes back as bytes."""
+        raw = encode_frame(4, PROTO_CMD_REPLY, b"\x01\x02")
+        frame = decode_frame(memoryview(raw))
+        assert frame.addr == 4
+        assert frame.payload == b"\x01\x02"
+        assert isinstance(frame.payload, bytes)
+
     def test_error_short_frame(self):
         """Frames shorter than 6 bytes should be rejected."""
         with pytest.raises(ValueError, match="too short"):
@@ -235,6 +263,12 @@ class TestDecodeFrame:
         with pytest.raises(ValueError, match="addr out of range"):
             decode_frame(raw)
 
+    def test_addr_checked_before_crc(self):
+        """A bad address is reported without computing the CRC."""
+        raw = bytes([PROTO_START, 0x00, PROTO_CMD_POLL, 0x00, 0x00, 0x00])
+        with pytest.raises(ValueError, match="addr out of range"):
+            decode_frame(raw)
+
 
 # -- parse_reply -------------------------------------------------------------
 
@@ -298,7 +332,7 @@ class TestFuzz:
         rng = random.Random(42)
         for _ in range(1000):
             length = rng.randint(0, 30)
-            data = bytes(rng.randint(0, 255) for _ in range(length))
+            data = rng.randbytes(length)
             try:
                 decode_frame(data)
             except ValueError:
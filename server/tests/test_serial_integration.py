@@ -1,4 +1,4 @@
-"""Integration tests: poller + simulator over socat PTY pair.
+"""Integration tests: daemon + simulator over socat PTY pair.
 
 These tests require socat to be installed and are excluded from
 the default ``make check-server`` run (marker: ``integration``).
@@ -7,24 +7,21 @@ Run with::
 
     make check-integration
 
-Note: these tests verify that the expected number of rows appear in
-SQLite storage, but do not read back individual column values to
-confirm that the stored temperatures match what the simulator produced.
+Only the end-to-end daemon run lives here; poll semantics are covered
+against the in-memory ``FakeBus`` in test_serial_poller.py, which
+needs no PTY setup.
 """
 
 import os
 import signal
 import shutil
+import sqlite3
 import subprocess
 import sys
 import time
 
 import pytest
 
-from tmon.serial_bus import SerialBus
-from tmon.serial_poller import Poller
-from tmon.storage import Storage
-
 pytestmark = pytest.mark.integration
 
 SERVER_PTY = "/tmp/tmon-test-server"
@@ -42,6 +39,29 @@ def _socat_available():
     return shutil.which("socat") is not None
 
 
+def _stop(proc: subprocess.Popen) -> None:
+    """Terminate *proc*, falling back to SIGKILL after one second."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=1)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _row_count(db_path: str) -> int:
+    """Return the number of stored readings, or 0 if not created yet."""
+    if not os.path.exists(db_path):
+        return 0
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
 @pytest.fixture
 def pty_pair():
     """Create a socat PTY pair and start the simulator.
@@ -80,10 +100,8 @@ def pty_pair():
 
     yield SERVER_PTY
 
-    sim.terminate()
-    sim.wait()
-    socat.terminate()
-    socat.wait()
+    _stop(sim)
+    _stop(socat)
     for p in (SERVER_PTY, CLIENT_PTY):
         if os.path.exists(p):
             os.unlink(p)
@@ -93,60 +111,6 @@ def pty_pair():
 class TestIntegration:
     """Integration tests using socat + simulator."""
 
-    def test_poll_single_client(self, pty_pair):
-        """Poller.poll_all polls the simulator and gets a reading."""
-        bus = SerialBus(pty_pair, 9600)
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [SIM_ADDR])
-
-        results = poller.poll_all()
-
-        assert len(results) == 1
-        r = results[0]
-        assert r.addr == SIM_ADDR
-        # All four channels should be present (valid int16 or None)
-        for val in (r.temp_0, r.temp_1, r.temp_2, r.temp_3):
-            if val is not None:
-                assert 50 <= val <= 900
-
-        # Verify storage was populated
-        rows = storage.fetch(10)
-        assert len(rows) == 1
-
-        bus.close()
-        storage.close()
-
-    def test_multiple_polls(self, pty_pair):
-        """Multiple poll_all calls accumulate readings in storage."""
-        bus = SerialBus(pty_pair, 9600)
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [SIM_ADDR])
-
-        for _ in range(3):
-            results = poller.poll_all()
-            assert len(results) == 1
-
-        rows = storage.fetch(10)
-        assert len(rows) == 3
-
-        bus.close()
-        storage.close()
-
-    def test_temp_values_in_range(self, pty_pair):
-        """Simulator produces temperatures in the 50-900 range."""
-        bus = SerialBus(pty_pair, 9600)
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [SIM_ADDR])
-
-        results = poller.poll_all()
-        r = results[0]
-        for val in (r.temp_0, r.temp_1, r.temp_2, r.temp_3):
-            if val is not None:
-                assert 50 <= val <= 900
-
-        bus.close()
-        storage.close()
-
     def test_daemon_subprocess(self, pty_pair, tmp_path):
         """Daemon starts, polls simulator, stores readings, shuts down."""
         db_path = os.path.join(str(tmp_path), "test.db")
@@ -164,12 +128,15 @@ class TestIntegration:
         proc = subprocess.Popen(
             [sys.executable, "-m", "tmon.daemon", config_path,
              "--transport", "rs485", "-v"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
-        # Let it run a few poll cycles
-        time.sleep(4)
+        # Let it run until a few poll cycles have been stored
+        for _ in range(30):
+            if _row_count(db_path) >= 2:
+                break
+            time.sleep(0.2)
 
         proc.send_signal(signal.SIGTERM)
         proc.wait(timeout=5)
@@ -180,10 +147,12 @@ class TestIntegration:
         assert proc.returncode in (0, -signal.SIGTERM)
 
         # Verify readings were stored
-        import sqlite3
         conn = sqlite3.connect(db_path)
-        cursor = conn.execute("SELECT COUNT(*) FROM readings")
-        count = cursor.fetchone()[0]
+        temps = conn.execute(
+            "SELECT temp_0, temp_1, temp_2, temp_3 FROM readings"
+        ).fetchall()
         conn.close()
 
-        assert count >= 2
+        assert len(temps) >= 2
+        # Simulator produces temperatures in the 50-900 range.
+        assert all(v is None or 50 <= v <= 900 for row in temps for v in row)
@@ -1,22 +1,28 @@
 """Tests for tmon.serial_poller."""
 
+import types
+
+import tmon.serial_poller as poller_mod
 from conftest import FakeBus, make_reply
 from tmon.serial_poller import Poller
 from tmon.reading import Reading
-from tmon.storage import Storage
 from tmon.protocol import PROTO_TEMP_INVALID
 
+# Canonical replies shared by several tests; built once at import.
+REPLY_3 = make_reply(3, 235, 198, PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+REPLY_1 = make_reply(1, 100, PROTO_TEMP_INVALID,
+                     PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+REPLY_2 = make_reply(2, 200, PROTO_TEMP_INVALID,
+                     PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+
 
 class TestPollClient:
     """Tests for Poller.poll."""
 
-    def test_success(self):
+    def test_success(self, store):
         """Successful poll returns a Reading with raw int16 temps."""
-        reply = make_reply(3, 235, 198, PROTO_TEMP_INVALID,
-                            PROTO_TEMP_INVALID)
-        bus = FakeBus([reply])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [3])
+        bus = FakeBus([REPLY_3])
+        poller = Poller(bus, store, [3])
 
         reading = poller.poll(3)
 
@@ -27,77 +33,62 @@ class TestPollClient:
         assert reading.temp_1 == 198
         assert reading.temp_2 is None
         assert reading.temp_3 is None
-        storage.close()
+        assert reading.temps == (235, 198, None, None)
 
-    def test_timeout(self):
+    def test_timeout(self, store):
         """Timeout returns None."""
         bus = FakeBus([b""])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [1])
+        poller = Poller(bus, store, [1])
 
         reading = poller.poll(1)
         assert reading is None
-        storage.close()
 
-    def test_bad_crc(self):
+    def test_bad_crc(self, store):
         """Corrupted CRC returns None."""
-        reply = make_reply(3, 235, 198, PROTO_TEMP_INVALID,
-                            PROTO_TEMP_INVALID)
         # Flip last byte to corrupt CRC
-        corrupted = reply[:-1] + bytes([reply[-1] ^ 0xFF])
+        corrupted = REPLY_3[:-1] + bytes([REPLY_3[-1] ^ 0xFF])
         bus = FakeBus([corrupted])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [3])
+        poller = Poller(bus, store, [3])
 
         reading = poller.poll(3)
         assert reading is None
-        storage.close()
 
-    def test_wrong_addr(self):
+    def test_wrong_addr(self, store):
         """Reply from wrong address returns None."""
         reply = make_reply(5, 100, PROTO_TEMP_INVALID,
                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
         bus = FakeBus([reply])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [3])
+        poller = Poller(bus, store, [3])
 
         reading = poller.poll(3)
         assert reading is None
-        storage.close()
 
-    def test_all_channels_valid(self):
+    def test_all_channels_valid(self, store):
         """All four channels valid returns four raw int16 temps."""
         reply = make_reply(1, 100, 200, 300, 400)
         bus = FakeBus([reply])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [1])
+        poller = Poller(bus, store, [1])
 
         reading = poller.poll(1)
         assert reading.temp_0 == 100
         assert reading.temp_1 == 200
         assert reading.temp_2 == 300
         assert reading.temp_3 == 400
-        storage.close()
 
-    def test_negative_temps(self):
+    def test_negative_temps(self, store):
         """Negative temperatures are unpacked correctly."""
         reply = make_reply(1, -100, PROTO_TEMP_INVALID,
                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
         bus = FakeBus([reply])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [1])
+        poller = Poller(bus, store, [1])
 
         reading = poller.poll(1)
         assert reading.temp_0 == -100
-        storage.close()
 
-    def test_sends_poll_frame(self):
+    def test_sends_poll_frame(self, store):
         """poll sends a correctly encoded POLL frame."""
-        reply = make_reply(3, 100, PROTO_TEMP_INVALID,
-                            PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
-        bus = FakeBus([reply])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [3])
+        bus = FakeBus([REPLY_3])
+        poller = Poller(bus, store, [3])
 
         poller.poll(3)
 
@@ -108,21 +99,15 @@ class TestPollClient:
         assert sent[1] == 3     # ADDR
         assert sent[2] == 0x01  # CMD = POLL
         assert sent[3] == 0     # LEN = 0
-        storage.close()
 
 
 class TestRunOnce:
     """Tests for Poller.poll_all."""
 
-    def test_polls_all_clients(self):
+    def test_polls_all_clients(self, store):
         """poll_all polls each client and returns readings."""
-        reply1 = make_reply(1, 100, PROTO_TEMP_INVALID,
-                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
-        reply2 = make_reply(2, 200, PROTO_TEMP_INVALID,
-                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
-        bus = FakeBus([reply1, reply2])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [1, 2])
+        bus = FakeBus([REPLY_1, REPLY_2])
+        poller = Poller(bus, store, [1, 2])
 
         results = poller.poll_all()
 
@@ -131,37 +116,60 @@ class TestRunOnce:
         assert results[1].addr == 2
 
         # Verify storage got both readings
-        rows = storage.fetch(10)
+        rows = store.fetch(10)
         assert len(rows) == 2
-        storage.close()
 
-    def test_partial_failure(self):
+    def test_partial_failure(self, store):
         """poll_all skips failed clients and stores successful ones."""
-        reply1 = make_reply(1, 100, PROTO_TEMP_INVALID,
-                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
         # Client 2 times out
-        bus = FakeBus([reply1, b""])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [1, 2])
+        bus = FakeBus([REPLY_1, b""])
+        poller = Poller(bus, store, [1, 2])
 
         results = poller.poll_all()
 
         assert len(results) == 1
         assert results[0].addr == 1
 
-        rows = storage.fetch(10)
+        rows = store.fetch(10)
         assert len(rows) == 1
-        storage.close()
 
-    def test_all_timeout(self):
+    def test_all_timeout(self, store):
         """poll_all returns empty list when all clients time out."""
         bus = FakeBus([b"", b""])
-        storage = Storage(":memory:")
-        poller = Poller(bus, storage, [1, 2])
+        poller = Poller(bus, store, [1, 2])
 
         results = poller.poll_all()
 
         assert results == []
-        rows = storage.fetch(10)
+        rows = store.fetch(10)
         assert len(rows) == 0
-        storage.close()
+
+    def test_stamps_each_reply(self, store, monkeypatch):
+        """Each stored row keeps the time its own reply arrived."""
+        clock = iter([1717243200.0, 1717243205.0])
+        monkeypatch.setattr(poller_mod, "time",
+                            types.SimpleNamespace(time=lambda: next(clock)))
+        bus = FakeBus([REPLY_1, REPLY_2])
+        poller = Poller(bus, store, [1, 2])
+
+        poller.poll_all()
+
+        rows = store.fetch(10)
+        assert [(r["addr"], r["ts"]) for r in rows] == [
+            (2, 1717243205), (1, 1717243200),
+        ]
+
+    def test_repeated_cycles_accumulate(self, store):
+        """Successive poll_all calls add rows rather than replacing them."""
+        replies = [make_reply(3, 100 + i, PROTO_TEMP_INVALID,
+                              PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+                   for i in range(3)]
+        bus = FakeBus(replies)
+        poller = Poller(bus, store, [3])
+
+        for _ in range(3):
+            results = poller.poll_all()
+            assert len(results) == 1
+
+        rows = store.fetch(10)
+        assert [r["temp_0"] for r in rows] == [102, 101, 100]
@@ -1,10 +1,10 @@
 """Tests for tmon.storage."""
 
-import re
 import time
 
 import pytest
 
+from tmon.reading import Reading
 from tmon.storage import Storage
 
 
@@ -21,9 +21,17 @@ class TestStorage:
         assert "readings" in tables
         store.close()
 
-    def test_insert_and_fetch(self):
+    def test_wal_and_synchronous_normal(self, tmp_path):
+        """File-backed Storage uses WAL with synchronous=NORMAL."""
+        store = Storage(str(tmp_path / "t.db"))
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        sync = store._conn.execute("PRAGMA synchronous").fetchone()[0]
+        assert mode == "wal"
+        assert sync == 1  # NORMAL
+        store.close()
+
+    def test_insert_and_fetch(self, store):
         """insert + commit + fetch round-trips data."""
-        store = Storage(":memory:")
         store.insert(1, [235, 198, None, None])
         store.commit()
         rows = store.fetch(10)
@@ -34,11 +42,9 @@ class TestStorage:
         assert row["temp_1"] == 198
         assert row["temp_2"] is None
         assert row["temp_3"] is None
-        store.close()
 
-    def test_null_temps(self):
+    def test_null_temps(self, store):
         """All four temps can be None."""
-        store = Storage(":memory:")
         store.insert(5, [None, None, None, None])
         store.commit()
         rows = store.fetch(1)
@@ -46,11 +52,9 @@ class TestStorage:
         assert rows[0]["temp_1"] is None
         assert rows[0]["temp_2"] is None
         assert rows[0]["temp_3"] is None
-        store.close()
 
-    def test_all_temps_present(self):
+    def test_all_temps_present(self, store):
         """All four temps can be non-None."""
-        store = Storage(":memory:")
         store.insert(2, [100, 200, 300, 400])
         store.commit()
         rows = store.fetch(1)
@@ -59,68 +63,76 @@ class TestStorage:
         assert row["temp_1"] == 200
         assert row["temp_2"] == 300
         assert row["temp_3"] == 400
-        store.close()
 
-    def test_ordering_newest_first(self):
+    def test_ordering_newest_first(self, store):
         """fetch returns newest rows first."""
-        store = Storage(":memory:")
         store.insert(1, [100, None, None, None])
         store.insert(1, [200, None, None, None])
         store.insert(1, [300, None, None, None])
         store.commit()
         rows = store.fetch(10)
         assert [r["temp_0"] for r in rows] == [300, 200, 100]
-        store.close()
 
-    def test_fetch_limit(self):
+    def test_fetch_limit(self, store):
         """fetch honours the count limit."""
-        store = Storage(":memory:")
         for i in range(5):
             store.insert(1, [i * 10, None, None, None])
         store.commit()
         rows = store.fetch(2)
         assert len(rows) == 2
-        store.close()
 
-    def test_timestamp_format(self):
+    def test_timestamp_format(self, store):
         """Timestamp is a Unix epoch integer."""
-        store = Storage(":memory:")
         store.insert(1, [100, None, None, None])
         store.commit()
         rows = store.fetch(1)
         ts = rows[0]["ts"]
         assert isinstance(ts, int)
         assert ts > 0
-        store.close()
 
-    def test_negative_temps(self):
+    def test_negative_temps(self, store):
         """Negative temperatures are stored correctly."""
-        store = Storage(":memory:")
         store.insert(1, [-100, None, None, None])
         store.commit()
         rows = store.fetch(1)
         assert rows[0]["temp_0"] == -100
-        store.close()
 
-    def test_multiple_clients(self):
+    def test_multiple_clients(self, store):
         """Readings from different clients coexist."""
-        store = Storage(":memory:")
         store.insert(1, [100, None, None, None])
         store.insert(2, [200, None, None, None])
         store.commit()
         rows = store.fetch(10)
         addrs = {r["addr"] for r in rows}
         assert addrs == {1, 2}
-        store.close()
 
-    def test_wrong_temps_length(self):
+    def test_insert_many(self, store):
+        """insert_many stores one row per reading with its own ts, in order."""
+        store.insert_many([
+            (1717243200, Reading(addr=1, temp_0=100, temp_1=None,
+                                 temp_2=None, temp_3=None)),
+            (1717243203, Reading(addr=2, temp_0=200, temp_1=201,
+                                 temp_2=202, temp_3=203)),
+        ])
+        store.commit()
+        rows = store.fetch(10)
+        assert [r["addr"] for r in rows] == [2, 1]
+        assert rows[0]["temp_3"] == 203
+        assert rows[1]["temp_1"] is None
+        assert [r["ts"] for r in rows] == [1717243203, 1717243200]
+
+    def test_insert_many_empty(self, store):
+        """insert_many with no readings inserts nothing."""
+        store.insert_many([])
+        store.commit()
+        assert store.fetch(10) == []
+
+    def test_wrong_temps_length(self, store):
         """insert rejects temps with wrong length."""
-        store = Storage(":memory:")
         with pytest.raises(ValueError):
             store.insert(1, [100, 200])
         with pytest.raises(ValueError):
             store.insert(1, [100, 200, 300, 400, 500])
-        store.close()
 
 
 class TestStorageContextManager:
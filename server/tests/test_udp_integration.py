@@ -11,16 +11,19 @@ that the stored values match what was sent.
 """
 
 import socket
-import threading
 import time
 
 import pytest
 
 from tmon.udp_listener import UDPListener
-from tmon.storage import Storage
 from tmon.udp_receiver import UDPReceiver
 
-from conftest import make_reply
+from conftest import make_reply, send_udp_later
+
+# Frames pushed by the simulated clients; built once at import.
+FRAME_1 = make_reply(1, 100, 0, 0, 0)
+FRAME_2 = make_reply(2, 200, 0, 0, 0)
+FRAME_3 = make_reply(3, 300, 0, 0, 0)
 
 
 def _find_free_port() -> int:
@@ -30,37 +33,23 @@ def _find_free_port() -> int:
         return s.getsockname()[1]
 
 
-def _send_udp(port: int, data: bytes) -> None:
-    """Send a UDP datagram to localhost:port."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.sendto(data, ("127.0.0.1", port))
-    sock.close()
-
-
 @pytest.mark.integration
 class TestUDPIntegration:
     """Integration tests for UDP push transport."""
 
-    def test_receive_single_reading(self) -> None:
+    def test_receive_single_reading(self, store) -> None:
         """Receive a single pushed reading via UDP."""
         port = _find_free_port()
         receiver = UDPReceiver(port)
-        storage = Storage(":memory:")
-        collector = UDPListener(receiver, storage)
+        collector = UDPListener(receiver, store)
 
         try:
             # Push a REPLY frame
             frame = make_reply(1, 250, 255, 0, -100)
 
-            def push_later():
-                time.sleep(0.05)
-                _send_udp(port, frame)
-
-            t = threading.Thread(target=push_later)
-            t.start()
-
+            pushed = send_udp_later(port, [frame], 0.05)
             reading = collector.receive(1.0)
-            t.join()
+            pushed.result()
 
             assert reading is not None
             assert reading.addr == 1
@@ -70,103 +59,73 @@ class TestUDPIntegration:
             assert reading.temp_3 == -100
 
             # Verify stored
-            rows = storage.fetch(10)
+            rows = store.fetch(10)
             assert len(rows) == 1
             assert rows[0]["addr"] == 1
         finally:
             receiver.close()
-            storage.close()
 
-    def test_receive_multiple_clients(self) -> None:
+    def test_receive_multiple_clients(self, store) -> None:
         """Receive pushed readings from multiple clients."""
         port = _find_free_port()
         receiver = UDPReceiver(port)
-        storage = Storage(":memory:")
-        collector = UDPListener(receiver, storage)
+        collector = UDPListener(receiver, store)
 
         try:
-            frame1 = make_reply(1, 100, 0, 0, 0)
-            frame2 = make_reply(2, 200, 0, 0, 0)
-            frame3 = make_reply(3, 300, 0, 0, 0)
-
-            def push_later():
-                time.sleep(0.05)
-                _send_udp(port, frame1)
-                time.sleep(0.02)
-                _send_udp(port, frame2)
-                time.sleep(0.02)
-                _send_udp(port, frame3)
-
-            t = threading.Thread(target=push_later)
-            t.start()
-
+            pushed = send_udp_later(port, [FRAME_1, FRAME_2, FRAME_3], 0.05)
             r1 = collector.receive(1.0)
             r2 = collector.receive(1.0)
             r3 = collector.receive(1.0)
-            t.join()
+            pushed.result()
 
             temps = {r.addr: r.temp_0 for r in [r1, r2, r3]}
             assert temps[1] == 100
             assert temps[2] == 200
             assert temps[3] == 300
 
-            rows = storage.fetch(10)
+            rows = store.fetch(10)
             assert len(rows) == 3
         finally:
             receiver.close()
-            storage.close()
 
-    def test_receive_timeout_no_data(self) -> None:
+    def test_receive_timeout_no_data(self, store) -> None:
         """receive returns None when no data arrives."""
         port = _find_free_port()
         receiver = UDPReceiver(port)
-        storage = Storage(":memory:")
-        collector = UDPListener(receiver, storage)
+        collector = UDPListener(receiver, store)
 
         try:
-            start = time.time()
+            start = time.perf_counter()
             reading = collector.receive(0.1)
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
 
             assert reading is None
-            assert elapsed < 0.3
+            assert 0.09 < elapsed < 0.2
         finally:
             receiver.close()
-            storage.close()
 
-    def test_corrupted_frame_ignored(self) -> None:
+    def test_corrupted_frame_ignored(self, store) -> None:
         """Corrupted frames are ignored, good frames are processed."""
         port = _find_free_port()
         receiver = UDPReceiver(port)
-        storage = Storage(":memory:")
-        collector = UDPListener(receiver, storage)
+        collector = UDPListener(receiver, store)
 
         try:
-            good_frame = make_reply(1, 100, 0, 0, 0)
             # Corrupt the CRC
-            bad_frame = good_frame[:-1] + bytes([good_frame[-1] ^ 0xFF])
-
-            def push_later():
-                time.sleep(0.05)
-                _send_udp(port, bad_frame)  # Should be ignored
-                time.sleep(0.02)
-                _send_udp(port, good_frame)  # Should be processed
-
-            t = threading.Thread(target=push_later)
-            t.start()
+            bad_frame = FRAME_1[:-1] + bytes([FRAME_1[-1] ^ 0xFF])
 
+            pushed = send_udp_later(port, [bad_frame, FRAME_1], 0.05)
             # First receive gets the bad frame (returns None)
             r1 = collector.receive(1.0)
             # Second receive gets the good frame
             r2 = collector.receive(1.0)
-            t.join()
+            pushed.result()
 
             assert r1 is None
             assert r2 is not None
             assert r2.addr == 1
 
-            rows = storage.fetch(10)
+            rows = store.fetch(10)
             assert len(rows) == 1
         finally:
             receiver.close()
-            storage.close()
@@ -5,23 +5,7 @@ from tmon.udp_listener import UDPListener
 from tmon.protocol import encode_frame, PROTO_CMD_REPLY, PROTO_TEMP_INVALID
 from tmon.storage import Storage
 
-from conftest import make_reply
-
-
-class FakeReceiver:
-    """Fake receiver that returns pre-configured frames."""
-
-    def __init__(self, frames: list[bytes]):
-        self._frames = list(frames)
-        self._index = 0
-
-    def recv(self, timeout_s: float) -> bytes:
-        """Return next frame or empty bytes."""
-        if self._index < len(self._frames):
-            frame = self._frames[self._index]
-            self._index += 1
-            return frame
-        return b""
+from conftest import FakeReceiver, make_reply
 
 
 class TestReceiveOne:
@@ -108,3 +92,56 @@ class TestReceiveOne:
 
         assert reading.temp_0 == -100
         storage.close()
+
+
+class TestReceiveBatch:
+    """Tests for receive_batch."""
+
+    def test_drains_queued_frames(self) -> None:
+        """All queued frames are stored and returned in order."""
+        frames = [make_reply(a, a * 10, PROTO_TEMP_INVALID,
+                             PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+                  for a in (1, 2, 3)]
+        storage = Storage(":memory:")
+        collector = UDPListener(FakeReceiver(frames), storage)
+
+        readings = collector.receive_batch(1.0, 32)
+
+        assert [r.addr for r in readings] == [1, 2, 3]
+        assert len(storage.fetch(10)) == 3
+        storage.close()
+
+    def test_skips_bad_frames(self) -> None:
+        """A corrupted frame in the batch is dropped, the rest stored."""
+        good = make_reply(1, 100, PROTO_TEMP_INVALID,
+                          PROTO_TEMP_INVALID, PROTO_TEMP_INVALID)
+        bad = good[:-1] + bytes([good[-1] ^ 0xFF])
+        storage = Storage(":memory:")
+        collector = UDPListener(FakeReceiver([bad, good]), storage)
+
+        readings = collector.receive_batch(1.0, 32)
+
+        assert [r.addr for r in readings] == [1]
+        assert len(storage.fetch(10)) == 1
+        storage.close()
+
+    def test_respects_max_frames(self) -> None:
+        """At most max_frames are read; the rest stay queued."""
+        frames = [make_reply(a, 0, 0, 0, 0) for a in (1, 2, 3)]
+        storage = Storage(":memory:")
+        collector = UDPListener(FakeReceiver(frames), storage)
+
+        first = collector.receive_batch(1.0, 2)
+        second = collector.receive_batch(1.0, 2)
+
+        assert [r.addr for r in first] == [1, 2]
+        assert [r.addr for r in second] == [3]
+        storage.close()
+
+    def test_timeout_returns_empty(self) -> None:
+        """Nothing received returns an empty list."""
+        storage = Storage(":memory:")
+        collector = UDPListener(FakeReceiver([]), storage)
+
+        assert collector.receive_batch(0.1, 32) == []
+        storage.close()
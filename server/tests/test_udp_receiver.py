@@ -1,11 +1,16 @@
 """Tests for UDPReceiver."""
 
 import socket
-import threading
 import time
 
+from tmon.protocol import PROTO_TEMP_INVALID
 from tmon.udp_receiver import UDPReceiver
 
+from conftest import make_reply, send_udp, send_udp_later
+
+# A client 3 REPLY; built once at import.
+FRAME = make_reply(3, 1000, 500, 0, PROTO_TEMP_INVALID)
+
 
 def _find_free_port() -> int:
     """Find an available UDP port."""
@@ -14,13 +19,6 @@ def _find_free_port() -> int:
         return s.getsockname()[1]
 
 
-def _send_udp(port: int, data: bytes) -> None:
-    """Send a UDP datagram to localhost:port."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.sendto(data, ("127.0.0.1", port))
-    sock.close()
-
-
 class TestUDPReceiverRecvTimeout:
     """Tests for recv."""
 
@@ -29,12 +27,12 @@ class TestUDPReceiverRecvTimeout:
         port = _find_free_port()
         bus = UDPReceiver(port)
         try:
-            start = time.time()
+            start = time.perf_counter()
             result = bus.recv(0.1)
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
 
             assert result == b""
-            assert elapsed < 0.3
+            assert 0.09 < elapsed < 0.2
         finally:
             bus.close()
 
@@ -43,19 +41,78 @@ class TestUDPReceiverRecvTimeout:
         port = _find_free_port()
         bus = UDPReceiver(port)
         try:
-            frame = b"\x01\x03\x02\x08\xe8\x03\xf4\x01\x00\x00\xff\x7f\xdb\x5a"
+            sent = send_udp_later(port, [FRAME], 0.05)
+            result = bus.recv(1.0)
+            sent.result()
+
+            assert result == FRAME
+        finally:
+            bus.close()
+
+    def test_back_to_back_frames_are_independent(self) -> None:
+        """Consecutive recv results do not share the receive buffer."""
+        port = _find_free_port()
+        bus = UDPReceiver(port)
+        try:
+            send_udp(port, b"\x01\x02\x03")
+            send_udp(port, b"\x04\x05")
+            first = bus.recv(1.0)
+            second = bus.recv(1.0)
+            assert first == b"\x01\x02\x03"
+            assert second == b"\x04\x05"
+        finally:
+            bus.close()
 
-            def send_later():
-                time.sleep(0.05)
-                _send_udp(port, frame)
 
-            t = threading.Thread(target=send_later)
-            t.start()
+class TestUDPReceiverRecvBatch:
+    """Tests for recv_batch."""
+
+    def test_drains_queued_frames(self) -> None:
+        """All queued datagrams come back in one call, in order."""
+        port = _find_free_port()
+        bus = UDPReceiver(port)
+        try:
+            send_udp(port, b"\x01")
+            send_udp(port, b"\x02")
+            send_udp(port, b"\x03")
+            assert bus.recv_batch(1.0, 10) == [b"\x01", b"\x02", b"\x03"]
+            assert bus.recv_batch(0, 10) == []
+        finally:
+            bus.close()
+
+    def test_stops_at_max_frames(self) -> None:
+        """No more than max_frames are read; the rest stay queued."""
+        port = _find_free_port()
+        bus = UDPReceiver(port)
+        try:
+            send_udp(port, b"\x01")
+            send_udp(port, b"\x02")
+            assert bus.recv_batch(1.0, 1) == [b"\x01"]
+            assert bus.recv_batch(1.0, 1) == [b"\x02"]
+        finally:
+            bus.close()
+
+    def test_timeout_returns_empty(self) -> None:
+        """recv_batch returns an empty list on timeout."""
+        port = _find_free_port()
+        bus = UDPReceiver(port)
+        try:
+            assert bus.recv_batch(0.05, 10) == []
+        finally:
+            bus.close()
 
-            result = bus.recv(1.0)
-            t.join()
 
-            assert result == frame
+class TestUDPReceiverBuffer:
+    """Tests for the receive buffer size."""
+
+    def test_rcvbuf_larger_than_default(self) -> None:
+        """The socket's receive buffer exceeds a fresh socket's default."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            default = s.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        bus = UDPReceiver(_find_free_port())
+        try:
+            size = bus._sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+            assert size > default
         finally:
             bus.close()
 
@@ -26,10 +26,12 @@ sys.path.insert(0, str(__import__("pathlib").Path(__file__).resolve().parents[1]
 
 from tmon.serial_bus import SerialBus
 from tmon.protocol import (
+    crc16_modbus,
     encode_frame,
     decode_frame,
     PROTO_CMD_POLL,
     PROTO_CMD_REPLY,
+    PROTO_REPLY_PAYLOAD_LEN,
     PROTO_TEMP_INVALID,
 )
 
@@ -41,15 +43,26 @@ def run(port: str, baudrate: int) -> None:
     replies to POLL frames with synthetic temperature data.  Responds
     to any address.  Each channel produces a random value between 50
     and 900 (5.0 to 90.0 C) with a ~10% chance of being PROTO_TEMP_INVALID.
+
+    The reply is built once and patched in place for each POLL: only
+    the address, the temperatures and the CRC change.
     """
     bus = SerialBus(port, baudrate)
+    reply = bytearray(encode_frame(1, PROTO_CMD_REPLY,
+                                   bytes(PROTO_REPLY_PAYLOAD_LEN)))
+    crc_off = len(reply) - 2
+    rng = random.Random()
+    rand = rng.random
+    randint = rng.randint
 
     print("serial_simulator: listening on {}".format(port), flush=True)
 
     try:
         while True:
             raw = bus.receive()
-            if not raw:
+            # The CMD byte is known before the CRC; skip anything but
+            # POLL (e.g. another client's REPLY) without checking it.
+            if not raw or raw[2] != PROTO_CMD_POLL:
                 continue
 
             try:
@@ -57,19 +70,14 @@ def run(port: str, baudrate: int) -> None:
             except ValueError:
                 continue
 
-            if frame.cmd != PROTO_CMD_POLL:
-                continue
-
-            temps = []
-            for _ in range(4):
-                if random.random() < 0.1:
-                    temps.append(PROTO_TEMP_INVALID)
-                else:
-                    temps.append(random.randint(50, 900))
+            temps = [PROTO_TEMP_INVALID if rand() < 0.1 else randint(50, 900)
+                     for _ in range(4)]
 
-            payload = struct.pack("<hhhh", temps[0], temps[1],
-                                  temps[2], temps[3])
-            reply = encode_frame(frame.addr, PROTO_CMD_REPLY, payload)
+            reply[1] = frame.addr
+            struct.pack_into("<hhhh", reply, 4, temps[0], temps[1],
+                             temps[2], temps[3])
+            struct.pack_into("<H", reply, crc_off,
+                             crc16_modbus(reply[1:crc_off]))
             bus.send(reply)
     except KeyboardInterrupt:
         pass